@@ -1,33 +1,143 @@
-import shelve
+import atexit
+import functools
+import hashlib
+import json
 import logging
+import pickle
+import time
+from pathlib import Path
 
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec.
+    from json import loads as json_loads
 
-def reset_cache():
-    """Clear all cached data."""
-    try:
-        with shelve.open("cache.db", flag="n"):
-            logging.info("Cache reset successfully.")
-    except Exception as e:
-        logging.error(f"Error resetting cache: {e}")
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
 
 
-def load_cache():
-    """Load cached data from the shelve database."""
+CACHE_FILE = "cache.pkl"
+API_CACHE_FILE = Path.home() / ".cache" / "reportportal_alert" / "api_cache.json"
+# Seconds an API response stays valid in the API cache.
+API_CACHE_TTL = 300
+
+# Set whenever the in-memory caches diverge from their files.
+_dirty = False
+_api_dirty = False
+
+
+@functools.lru_cache(maxsize=1)
+def _cache():
+    """Load the cache file once per process and keep it in memory."""
     try:
-        with shelve.open("cache.db") as cache:
-            return dict(cache)
+        with open(CACHE_FILE, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         logging.error(f"Error loading cache: {e}")
         return {}
 
 
-def save_cache(data):
-    """Save data to the shelve database."""
+def _flush():
+    """Write the in-memory cache back to disk if it was modified."""
+    if not _dirty:
+        return
     try:
-        with shelve.open("cache.db") as cache:
-            # Ensure all keys are strings to avoid encoding issues.
-            data = {str(key): value for key, value in data.items()}
-            cache.update(data)
+        with open(CACHE_FILE, "wb") as f:
+            pickle.dump(_cache(), f, protocol=pickle.HIGHEST_PROTOCOL)
             logging.info("Cache saved successfully.")
     except Exception as e:
         logging.error(f"Error saving cache: {e}")
+
+
+atexit.register(_flush)
+
+
+@functools.lru_cache(maxsize=1)
+def _api_cache():
+    """
+    Load the API response cache once per process and keep it in memory.
+
+    Expired entries are dropped here so the file does not grow without bound.
+    """
+    global _api_dirty
+    try:
+        with open(API_CACHE_FILE, "rb") as f:
+            entries = json_loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.error(f"Error loading API cache: {e}")
+        return {}
+
+    now = time.time()
+    fresh = {
+        key: entry
+        for key, entry in entries.items()
+        if now - entry["time"] <= API_CACHE_TTL
+    }
+    if len(fresh) != len(entries):
+        _api_dirty = True
+    return fresh
+
+
+def _flush_api_cache():
+    """Write the API response cache back to disk if it was modified."""
+    if not _api_dirty:
+        return
+    try:
+        API_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(API_CACHE_FILE, "wb") as f:
+            f.write(json_dumps(_api_cache()))
+    except Exception as e:
+        logging.error(f"Error saving API cache: {e}")
+
+
+atexit.register(_flush_api_cache)
+
+
+def reset_cache():
+    """Clear all cached data."""
+    global _dirty, _api_dirty
+    _cache().clear()
+    _api_cache().clear()
+    _dirty = _api_dirty = True
+    logging.info("Cache reset successfully.")
+
+
+def load_cache():
+    """Return a copy of the cached data."""
+    return dict(_cache())
+
+
+def save_cache(data):
+    """Merge data into the cache; it is written to disk at exit."""
+    global _dirty
+    # Ensure all keys are strings to keep lookups consistent.
+    _cache().update({str(key): value for key, value in data.items()})
+    _dirty = True
+
+
+def api_cache_key(url, params):
+    """Hash a request URL and its bound query parameters into a cache key."""
+    h = hashlib.blake2b(url.encode(), digest_size=16)
+    for key, value in sorted(params.items()):
+        h.update(b"\x00")
+        h.update(f"{key}={value}".encode())
+    return h.hexdigest()
+
+
+def get_api_response(key):
+    """Return a cached API response, or None if it is missing or expired."""
+    entry = _api_cache().get(key)
+    if entry is None or time.time() - entry["time"] > API_CACHE_TTL:
+        return None
+    return entry["data"]
+
+
+def set_api_response(key, data):
+    """Store an API response; the cache is written to disk at exit."""
+    global _api_dirty
+    _api_cache()[key] = {"time": time.time(), "data": data}
+    _api_dirty = True
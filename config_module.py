@@ -1,5 +1,15 @@
 import json
 import logging
+import os
+from typing import Dict, Tuple
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib decoder also accepts bytes.
+    from json import loads as json_loads
+
+# Parsed config files keyed by (path, mtime) so repeated loads skip the parse.
+_CFG_CACHE: Dict[Tuple[str, int], dict] = {}
 
 
 class Config:
@@ -7,14 +17,22 @@ class Config:
         self.config_file = config_file
         self.base_url = None
         self.token = None
+        self.verify_ssl = True
         self._load_config()
 
     def _load_config(self):
         try:
-            with open(self.config_file, "r") as f:
-                config = json.load(f)
-                self.base_url = config.get("base_url", "").rstrip("/")
-                self.token = config.get("token", "")
+            path = os.path.abspath(self.config_file)
+            cache_key = (path, os.stat(path).st_mtime_ns)
+            config = _CFG_CACHE.get(cache_key)
+            if config is None:
+                with open(path, "rb") as f:
+                    config = json_loads(f.read())
+                _CFG_CACHE[cache_key] = config
+
+            self.base_url = config.get("base_url", "").rstrip("/")
+            self.token = config.get("token", "")
+            self.verify_ssl = config.get("verify_ssl", True)
             if not self.base_url or not self.token:
                 raise ValueError("Configuration file is missing 'base_url' or 'token'.")
 
@@ -3,11 +3,17 @@ import logging
 from tabulate import tabulate
 from typing import Dict
 import csv
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from config_module import Config
 from cache_module import reset_cache, save_cache, load_cache
 from report_portal_client import ReportPortalClient
 
-logging.basicConfig(level=logging.INFO)
+try:
+    from wcwidth import wcswidth as _width
+except ImportError:  # tabulate falls back to len() as well without wcwidth.
+    _width = len
 
 
 def prepare_filters(args) -> Dict[str, str]:
@@ -23,12 +29,100 @@ def prepare_filters(args) -> Dict[str, str]:
     if args.start_to:
         filters["filter.lte.endTime"] = args.start_to
     if args.attr:
-        attr_key, attr_value = args.attr.split("=", 1)
-        filters["filter.has.compositeAttribute"] = f"{attr_key}:{attr_value}"
+        # The "has" filter takes a comma-separated list, so every attribute
+        # is sent instead of only the last one.
+        filters["filter.has.compositeAttribute"] = ",".join(args.attr)
     logging.info(f"Filters being applied for launches: {filters}")
     return filters
 
 
+def attribute_filter(value: str) -> str:
+    """argparse type turning a key=value attribute into ReportPortal's key:value."""
+    key, sep, attr_value = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected key=value, got {value!r}")
+    return f"{key}:{attr_value}"
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+# Above this many rows the table is rendered by fast_grid instead of tabulate.
+FAST_GRID_THRESHOLD = 200
+
+# ANSI escapes and line breaks tabulate measures differently from "\n".
+_NON_PLAIN = re.compile("[\x1b\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+
+
+def _is_text(cell: str) -> bool:
+    """Whether tabulate types a non-empty cell as text rather than number/bool."""
+    if cell in ("True", "False"):
+        return False
+    try:
+        float(cell.replace(",", ""))
+    except ValueError:
+        return True
+    return False
+
+
+def fast_grid(rows, headers) -> str:
+    """
+    Render rows in tabulate's "grid" layout without its per-cell overhead.
+
+    Widths are measured like tabulate does (wcwidth when installed), cell
+    whitespace is stripped and multiline cells span several lines. Tabulate
+    reformats and aligns numeric and boolean columns (e.g. "1e5" becomes
+    "100000"), so tables with such a column, ANSI escapes or line breaks other
+    than "\\n" are handed to tabulate instead.
+    """
+    str_rows = [["" if cell is None else str(cell) for cell in row] for row in rows]
+    for column in zip(*str_rows):
+        # Whitespace-only cells are not counted as text: tabulate may type
+        # them as numbers.
+        values = [cell.strip() for cell in column if cell]
+        numeric = values and not any(value and _is_text(value) for value in values)
+        if numeric or any(_NON_PLAIN.search(cell) for cell in column):
+            return tabulate(rows, headers=headers, tablefmt="grid")
+
+    # Like tabulate, once any cell spans lines an empty cell takes no lines,
+    # so a fully empty row collapses.
+    multiline = any("\n" in cell for row in str_rows for cell in row)
+    cell_rows = [
+        [
+            cell.strip().split("\n") if cell.strip() or not multiline else []
+            for cell in row
+        ]
+        for row in str_rows
+    ]
+    widths = [_width(header) + 2 for header in headers]
+    for row in cell_rows:
+        for index, lines in enumerate(row):
+            widths[index] = max([widths[index], *map(_width, lines)])
+
+    def pad(text, width):
+        # Pad to the visible width, as tabulate does for wide characters.
+        return text.ljust(width - _width(text) + len(text))
+
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    header_cells = (pad(header, width) for header, width in zip(headers, widths))
+    lines = [border, "| " + " | ".join(header_cells) + " |", border.replace("-", "=")]
+    for row in cell_rows:
+        height = max(map(len, row))
+        for line_no in range(height):
+            cells = (
+                pad(cell[line_no], width) if line_no < len(cell) else " " * width
+                for cell, width in zip(row, widths)
+            )
+            lines.append("| " + " | ".join(cells) + " |")
+        lines.append(border)
+    return "\n".join(lines)
+
+
 def main():
     parser = argparse.ArgumentParser(description="ReportPortal Alert Script")
     parser.add_argument("project_name", help="Project name (e.g., PROW)")
@@ -39,10 +133,27 @@ def main():
     parser.add_argument("--tags", help="Tags filter")
     parser.add_argument("--start-from", help="Start time filter (YYYY-MM-DD)")
     parser.add_argument("--start-to", help="End time filter (YYYY-MM-DD)")
-    parser.add_argument("--attr", help="Attribute filter (key=value)")
+    parser.add_argument(
+        "--attr",
+        action="append",
+        type=attribute_filter,
+        help="Attribute filter (key=value), can be repeated",
+    )
     parser.add_argument(
         "--no-verify", action="store_true", help="Disable SSL verification"
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=16,
+        help="Number of concurrent fetch threads (default: 16)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=positive_int,
+        default=8,
+        help="Maximum simultaneous requests to Report Portal (default: 8)",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -55,6 +166,8 @@ def main():
     )
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO)
+
     if args.reset_cache:
         reset_cache()
 
@@ -67,93 +180,123 @@ def main():
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     client = ReportPortalClient(
-        base_url=config.base_url, token=config.token, verify_ssl=verify_ssl
+        base_url=config.base_url,
+        token=config.token,
+        verify_ssl=verify_ssl,
+        max_concurrency=args.max_concurrency,
     )
 
-    # Prepare filters for server-side filtering
-    filters = prepare_filters(args)
-
-    # Fetch all valid launch IDs dynamically
     try:
-        launch_ids = client.fetch_launch_ids(args.project_name, filters)
-        if not launch_ids:
-            logging.error("No launches found for the project.")
+        # Prepare filters for server-side filtering
+        filters = prepare_filters(args)
+
+        # Fetch all valid launch IDs dynamically
+        try:
+            launch_ids = client.fetch_launch_ids(args.project_name, filters)
+            if not launch_ids:
+                logging.error("No launches found for the project.")
+                return
+            logging.info(f"Found launch IDs: {launch_ids}")
+        except Exception as e:
+            logging.error(f"Error fetching launch IDs: {e}")
             return
-        logging.info(f"Found launch IDs: {launch_ids}")
-    except Exception as e:
-        logging.error(f"Error fetching launch IDs: {e}")
-        return
 
-    cache = load_cache()
+        cache = load_cache()
 
-    try:
-        results_table = []
-        total_failed_tests = 0
-        total_failed_suites = 0  # Counter for failed suites
-        total_failed_launches = 0  # Counter for launches with failures
-
-        for launch_id in launch_ids:
-            suites = client.fetch_suites(args.project_name, launch_id)
-            launch_has_failures = False
-
-            for suite in suites:
-                suite_id = suite["id"]
-                failed_tests = client.fetch_tests(
-                    args.project_name,
-                    launch_id,
-                    suite_id,
-                    test_name_filter=args.test_name,
-                )
-
-                if failed_tests:
-                    launch_has_failures = True
+        try:
+            results_table = []
+            total_failed_suites = 0  # Counter for failed suites
+
+            # Fan out the suite queries for every launch and dispatch each
+            # launch's batched test query as soon as its suites arrive.
+            launch_suites = {}
+            test_futures = {}
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                suite_futures = {
+                    executor.submit(
+                        client.fetch_suites, args.project_name, launch_id
+                    ): launch_id
+                    for launch_id in launch_ids
+                }
+                for future in as_completed(suite_futures):
+                    launch_id = suite_futures[future]
+                    suites = future.result()
+                    # Launches without suites have no tests to query.
+                    if not suites:
+                        continue
+                    launch_suites[launch_id] = suites
+                    test_futures[launch_id] = executor.submit(
+                        client.fetch_tests_batch,
+                        args.project_name,
+                        launch_id,
+                        [suite["id"] for suite in suites],
+                        test_name_filter=args.test_name,
+                    )
+
+            # Results are consumed in launch order to keep the report stable.
+            launches_url = f"{client.base_url}/ui/#{args.project_name}/launches/all/"
+            test_fields = itemgetter("id", "name", "status")
+            results_append = results_table.append
+            failed_launches = set()
+            for launch_id in launch_ids:
+                if launch_id not in launch_suites:
+                    continue
+                tests_by_suite = test_futures[launch_id].result()
+                launch_url = f"{launches_url}{launch_id}/"
+
+                for suite in launch_suites[launch_id]:
+                    suite_id = suite["id"]
+                    failed_tests = tests_by_suite.get(suite_id)
+                    if not failed_tests:
+                        continue
+
+                    failed_launches.add(launch_id)
                     total_failed_suites += 1
                     logging.info(
                         f"Suite {suite_id} has {len(failed_tests)} failed tests."
                     )
-                    total_failed_tests += len(failed_tests)
-                    for test in failed_tests:
-                        test_url = f"{client.base_url}/ui/#{args.project_name}/launches/all/{launch_id}/{suite_id}/{test['id']}/log"
-                        results_table.append(
-                            [suite["name"], test["name"], test["status"], test_url]
-                        )
+                    suite_name = suite["name"]
+                    suite_url = f"{launch_url}{suite_id}/"
+                    for test_id, test_name, status in map(test_fields, failed_tests):
+                        test_url = suite_url + str(test_id) + "/log"
+                        results_append((suite_name, test_name, status, test_url))
                     cache[suite_id] = {
-                        "name": suite["name"],
+                        "name": suite_name,
                         "failed_tests": failed_tests,
                     }
 
-            if launch_has_failures:
-                total_failed_launches += 1
-
-        if args.output == "csv":
-            csv_file = "report_results.csv"
-            with open(csv_file, mode="w", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(
-                    ["Suite Name", "Test Name", "Status", "Test URL"]
-                )  # Header
-                writer.writerows(results_table)  # Data
-
-            print(f"\nCSV report saved as: {csv_file}")
-        elif args.output == "table":
-            print(
-                tabulate(
-                    results_table,
-                    headers=["Suite Name", "Test Name", "Status", "Test URL"],
-                    tablefmt="grid",
-                )
-            )
-            print(f"\nTotal Failed Tests: {total_failed_tests}")
-        elif args.output == "summary":
-            print("\n----Test Report Summary----")
-            print(f"\nTotal Failed Tests: {total_failed_tests}")
-            print(f"Total Suites with Failures: {total_failed_suites}")
-            print(f"Total Launches with Failures: {total_failed_launches}")
-        else:
-            print("No failed tests found.")
-        save_cache(cache)
-    except Exception as e:
-        logging.error(f"Error: {e}")
+            total_failed_tests = len(results_table)
+            total_failed_launches = len(failed_launches)
+
+            if args.output == "csv":
+                csv_file = "report_results.csv"
+                with open(csv_file, mode="w", newline="", buffering=1 << 20) as file:
+                    writer = csv.writer(file)
+                    writer.writerow(
+                        ["Suite Name", "Test Name", "Status", "Test URL"]
+                    )  # Header
+                    writer.writerows(results_table)  # Data
+
+                print(f"\nCSV report saved as: {csv_file}")
+            elif args.output == "table":
+                headers = ["Suite Name", "Test Name", "Status", "Test URL"]
+                if len(results_table) > FAST_GRID_THRESHOLD:
+                    print(fast_grid(results_table, headers))
+                else:
+                    print(tabulate(results_table, headers=headers, tablefmt="grid"))
+                print(f"\nTotal Failed Tests: {total_failed_tests}")
+            elif args.output == "summary":
+                print("\n----Test Report Summary----")
+                print(f"\nTotal Failed Tests: {total_failed_tests}")
+                print(f"Total Suites with Failures: {total_failed_suites}")
+                print(f"Total Launches with Failures: {total_failed_launches}")
+            else:
+                print("No failed tests found.")
+            save_cache(cache)
+        except Exception as e:
+            logging.error(f"Error: {e}")
+    finally:
+        client.close()
 
 
 if __name__ == "__main__":
@@ -1,78 +1,167 @@
 import requests
 import logging
-from typing import Dict, List
+import threading
+from cache_module import api_cache_key, get_api_response, set_api_response
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, List
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib decoder also accepts bytes.
+    from json import loads as json_loads
+
+# ReportPortal's maximum page size; fewer, fuller pages mean fewer round-trips.
+PAGE_SIZE = 300
+# Suite IDs per filter.in.parentId query, keeping URLs under server limits.
+SUITE_BATCH_SIZE = 50
 
 
 class ReportPortalClient:
-    def __init__(self, base_url, token, verify_ssl=True):
+    def __init__(self, base_url, token, verify_ssl=True, max_concurrency=8):
         self.base_url = base_url.rstrip("/")
         self.token = token
         self.verify_ssl = verify_ssl
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
+        # Caps in-flight requests across all threads sharing this client.
+        self._sem = threading.BoundedSemaphore(max_concurrency)
+
+        # One keep-alive session for every call so the TLS handshake is paid once.
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {self.token}",
+                "Content-Type": "application/json",
+            }
+        )
+        self.session.verify = verify_ssl
+        # Retry transient server errors and rate limiting with exponential backoff.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.4,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """Release the pooled connections held by the session."""
+        self.session.close()
+
+    def _get_json(self, endpoint: str, params: Dict) -> Dict:
+        with self._sem:
+            response = self.session.get(endpoint, params=params)
+        response.raise_for_status()
+        return json_loads(response.content)
+
+    def _paged_get(self, endpoint: str, params: Dict) -> List[Dict]:
+        """
+        Fetch every page of a listing endpoint.
+
+        The first page reveals ``page.totalPages``; the remaining pages are
+        then requested concurrently and concatenated in page order. Pages are
+        sorted by ID so they do not overlap, and any item that still shows up
+        twice (e.g. after a deletion mid-run) is only returned once.
+        """
+        params = {"page.sort": "id,ASC", **params, "page.size": PAGE_SIZE}
+        first = self._get_json(endpoint, {**params, "page.page": 1})
+        pages = [first]
+        total_pages = first.get("page", {}).get("totalPages", 1)
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=min(8, total_pages - 1)) as executor:
+                pages.extend(
+                    executor.map(
+                        lambda page: self._get_json(
+                            endpoint, {**params, "page.page": page}
+                        ),
+                        range(2, total_pages + 1),
+                    )
+                )
+
+        content = []
+        seen_ids = set()
+        for page in pages:
+            for item in page.get("content", []):
+                item_id = item.get("id")
+                if item_id is not None:
+                    if item_id in seen_ids:
+                        continue
+                    seen_ids.add(item_id)
+                content.append(item)
+        return content
+
+    def _cached(self, endpoint: str, params: Dict, fetch: Callable[[], Any]) -> Any:
+        """
+        Return fetch() for this request, served from the API cache while it
+        is fresh.
+        """
+        cache_key = api_cache_key(endpoint, params)
+        data = get_api_response(cache_key)
+        if data is None:
+            data = fetch()
+            set_api_response(cache_key, data)
+        return data
 
     def fetch_launch_ids(self, project_name: str, filters: Dict[str, str]) -> List[str]:
         """
         Fetch launch IDs with given filters.
         """
         launches_endpoint = f"{self.base_url}/api/v1/{project_name}/launch"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-        response = requests.get(
-            launches_endpoint, headers=headers, params=filters, verify=self.verify_ssl
-        )
-        response.raise_for_status()
 
-        # Process the response content
-        launches = response.json().get("content", [])
-        return [launch["id"] for launch in launches if "id" in launch]
+        def fetch():
+            launches = self._paged_get(launches_endpoint, filters)
+            return [launch["id"] for launch in launches if "id" in launch]
+
+        # Only the IDs are cached, under their own key, since the full launch
+        # objects are never used.
+        return self._cached(f"{launches_endpoint}#ids", filters, fetch)
 
     def fetch_suites(self, project_name: str, launch_id: str) -> List[Dict]:
         suites_endpoint = f"{self.base_url}/api/v1/{project_name}/item"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
         params = {
             "filter.eq.launchId": launch_id,
             "filter.eq.type": "SUITE",
-            "page.size": 100,
         }
-        logging.info(f"Fetching suites with params: {params}")
-        response = requests.get(
-            suites_endpoint, headers=headers, params=params, verify=self.verify_ssl
+        logging.debug("Fetching suites with params: %s", params)
+        return self._cached(
+            suites_endpoint,
+            params,
+            lambda: self._paged_get(suites_endpoint, params),
         )
-        response.raise_for_status()
-        return response.json().get("content", [])
 
-    def fetch_tests(
+    def fetch_tests_batch(
         self,
         project_name: str,
         launch_id: str,
-        suite_id: str,
+        suite_ids: List[str],
         test_name_filter: str = None,
-    ) -> List[Dict]:
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch the failed tests of several suites of a launch, querying up to
+        SUITE_BATCH_SIZE suites per request.
+
+        Returns the tests grouped by their parent suite ID.
+        """
         tests_endpoint = f"{self.base_url}/api/v1/{project_name}/item"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-        params = {
-            "filter.eq.launchId": launch_id,
-            "filter.eq.parentId": suite_id,
-            "filter.in.status": "FAILED",
-            "page.size": 100,
-        }
-        logging.info(f"Fetching tests with params: {params}")
-        response = requests.get(
-            tests_endpoint, headers=headers, params=params, verify=self.verify_ssl
-        )
-        response.raise_for_status()
-        tests = response.json().get("content", [])
-        if test_name_filter:
-            tests = [
-                test
-                for test in tests
-                if test_name_filter.lower() in test.get("name", "").lower()
-            ]
-        return tests
+        tests_by_suite = defaultdict(list)
+        for start in range(0, len(suite_ids), SUITE_BATCH_SIZE):
+            batch = suite_ids[start : start + SUITE_BATCH_SIZE]
+            params = {
+                "filter.eq.launchId": launch_id,
+                "filter.in.parentId": ",".join(str(suite_id) for suite_id in batch),
+                "filter.in.status": "FAILED",
+            }
+            if test_name_filter:
+                params["filter.cnt.name"] = test_name_filter
+            logging.debug("Fetching tests with params: %s", params)
+            for test in self._paged_get(tests_endpoint, params):
+                tests_by_suite[test.get("parent")].append(test)
+        return tests_by_suite